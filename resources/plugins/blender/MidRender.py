@@ -15,18 +15,24 @@ bl_info = {
 }
 
 import bpy
+import itertools
 import json
 import os
 import platform
 import socket
 import time
+from functools import lru_cache
 from bpy.props import EnumProperty, IntProperty, BoolProperty, StringProperty
 from bpy.types import Panel, Operator, PropertyGroup
 
 
+# -- Shared helpers ------------------------------------------------------------
+# Everything down to "End shared helpers" is duplicated verbatim in blender/MidRender.py
+# and cinema4d/MidRender.py (each plugin installs as a single file). Keep in sync.
+
 # -- Config helpers ------------------------------------------------------------
 
-def get_config_dir():
+def _compute_config_dir():
     sys = platform.system()
     if sys == "Windows":
         return os.path.join(os.environ.get("LOCALAPPDATA", ""), "MidRender")
@@ -37,25 +43,63 @@ def get_config_dir():
         return os.path.join(xdg, "MidRender")
 
 
+# Resolved once -- platform and env don't change while the host app runs
+_CONFIG_DIR = _compute_config_dir()
+_SUBMISSIONS_DIR = os.path.join(_CONFIG_DIR, "submissions")
+_SUBMISSIONS_DIR_SEP = _SUBMISSIONS_DIR + os.sep
+_CONFIG_PATH = os.path.join(_CONFIG_DIR, "config.json")
+
+# Looked up once -- gethostname() can stall on slow DNS/mDNS, and submit runs on the UI thread
+_HOSTNAME = socket.gethostname()
+
+# Wall-clock submission timestamps, clamped to be strictly increasing so an NTP
+# step back can't reorder submissions; the counter breaks ties in filenames
+_last_ts_ms = 0
+_submit_counter = itertools.count()
+
+
+def _now_ms():
+    global _last_ts_ms
+    _last_ts_ms = max(int(time.time() * 1000), _last_ts_ms + 1)
+    return _last_ts_ms
+
+
+_submissions_dir_ready = False
+
+
+def get_config_dir():
+    return _CONFIG_DIR
+
+
 def get_submissions_dir():
     """Local submissions dropbox -- monitor polls this directory."""
-    sub_dir = os.path.join(get_config_dir(), "submissions")
-    os.makedirs(sub_dir, exist_ok=True)
-    return sub_dir
+    global _submissions_dir_ready
+    if not _submissions_dir_ready:
+        os.makedirs(_SUBMISSIONS_DIR, exist_ok=True)
+        _submissions_dir_ready = True
+    return _SUBMISSIONS_DIR
+
+
+@lru_cache(maxsize=4)
+def _read_config_cached(config_path, mtime_ns):
+    # Raises on failure so lru_cache never stores a miss -- a read that races the
+    # Monitor rewriting config.json must not stick under an unchanged mtime
+    with open(config_path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 
 def read_config():
-    config_path = os.path.join(get_config_dir(), "config.json")
-    if not os.path.isfile(config_path):
-        return None
+    """Parsed config.json, re-read only when the file's mtime changes."""
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        mtime_ns = os.stat(_CONFIG_PATH).st_mtime_ns
+        return _read_config_cached(_CONFIG_PATH, mtime_ns)
     except Exception:
         return None
 
 
 def get_farm_path():
+    # Only the parsed config is cached; the folder check stays live so an
+    # unmounted sync drive is reported as disconnected
     config = read_config()
     if not config or not config.get("sync_root"):
         return None
@@ -65,6 +109,98 @@ def get_farm_path():
     return None
 
 
+def clear_config_cache():
+    """Drop cached config lookups so the next call hits the disk again."""
+    global _submissions_dir_ready
+    _read_config_cached.cache_clear()
+    _submissions_dir_ready = False
+
+
+# -- Submission I/O ------------------------------------------------------------
+
+# orjson is optional (not bundled with Blender/C4D); both paths emit compact UTF-8 bytes
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# Fixed v1 submission schema: scalars are formatted in directly, only strings and
+# the overrides dict go through the JSON encoder
+_SUBMISSION_TPL = (
+    b'{"_version":1,"template_id":%b,"job_name":%b,"submitted_by_host":%b,'
+    b'"submitted_at_ms":%d,"overrides":%b,"frame_start":%d,"frame_end":%d,'
+    b'"chunk_size":%d,"priority":%d}'
+)
+
+
+def encode_submission(template_id, job_name, host, ts, overrides,
+                      frame_start, frame_end, chunk_size, priority):
+    return _SUBMISSION_TPL % (
+        _dumps(template_id), _dumps(job_name), _dumps(host), ts, _dumps(overrides),
+        frame_start, frame_end, chunk_size, priority)
+
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_bytes(path, data):
+    """Write a small blob straight to the fd, skipping Python's buffered I/O stack."""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# -- End shared helpers --------------------------------------------------------
+
+
+# -- Farm status (panel) -------------------------------------------------------
+
+_farm_status_cache = {"t": None, "farm": None, "msg": ""}
+_FARM_STATUS_TTL_SECS = 5.0
+
+
+def _farm_status(ttl=_FARM_STATUS_TTL_SECS):
+    """(farm_path, error_message) for the panel, re-resolved at most every ttl seconds.
+
+    Panel.draw runs on every redraw, so it must not stat/parse config.json each time.
+    """
+    # Monotonic so a wall-clock step backwards can't pin a stale status
+    now = time.monotonic()
+    cache = _farm_status_cache
+    if cache["t"] is not None and now - cache["t"] < ttl:
+        return cache["farm"], cache["msg"]
+
+    farm = get_farm_path()
+    msg = ""
+    if not farm:
+        config = read_config()
+        if not config:
+            msg = "MidRender config not found."
+        elif not config.get("sync_root"):
+            msg = "Set sync root in MidRender Monitor."
+        else:
+            msg = "Farm folder not found."
+
+    cache["t"] = now
+    cache["farm"] = farm
+    cache["msg"] = msg
+    return farm, msg
+
+
+def _clear_caches():
+    clear_config_cache()
+    _farm_status_cache["t"] = None
+
+
 # -- Template ID ---------------------------------------------------------------
 
 TEMPLATE_ID = "blender-5.0-plugin"
@@ -177,6 +313,7 @@ class MIDRENDER_OT_submit(Operator):
         # Validate farm connection
         farm = get_farm_path()
         if not farm:
+            _clear_caches()
             config = read_config()
             if not config:
                 self.report({'ERROR'}, "MidRender config not found. Is the monitor installed?")
@@ -187,7 +324,7 @@ class MIDRENDER_OT_submit(Operator):
             return {'CANCELLED'}
 
         # Use local submissions dropbox
-        submissions_dir = get_submissions_dir()
+        get_submissions_dir()
 
         if not bpy.data.filepath:
             self.report({'ERROR'}, "Save the file before submitting.")
@@ -195,8 +332,9 @@ class MIDRENDER_OT_submit(Operator):
 
         template_id = TEMPLATE_ID
 
-        # Save file
-        bpy.ops.wm.save_mainfile()
+        # Save file (only if modified)
+        if bpy.data.is_dirty:
+            bpy.ops.wm.save_mainfile()
 
         # Scenes to submit
         if settings.submit_all_scenes:
@@ -204,68 +342,79 @@ class MIDRENDER_OT_submit(Operator):
         else:
             scenes = [context.scene]
 
-        hostname = socket.gethostname()
-        blend_name = os.path.splitext(os.path.basename(bpy.data.filepath))[0]
-        submitted = 0
-
+        # Loop invariants
+        blend_path = bpy.data.filepath
+        blend_name = os.path.splitext(os.path.basename(blend_path))[0]
+        multi = len(scenes) > 1
+        abspath = bpy.path.abspath
+        override_range = settings.override_range
+        override_out = ""
+        if settings.override_output and settings.output_path:
+            override_out = abspath(settings.output_path)
+        chunk_size = settings.chunk_size
+        priority = settings.priority
+        now_ms = _now_ms()
+
+        # Build every payload first so the dropbox writes happen in one tight pass
+        payloads = []
         for scene in scenes:
+            scene_name = scene.name
+
             # Job name
-            if len(scenes) > 1:
-                job_name = "{} - {}".format(blend_name, scene.name)
+            if multi:
+                job_name = "{} - {}".format(blend_name, scene_name)
             else:
                 job_name = blend_name
 
             # Frame range (override or scene)
-            if settings.override_range:
+            if override_range:
                 f_start = settings.frame_start
                 f_end = settings.frame_end
             else:
                 f_start = scene.frame_start
                 f_end = scene.frame_end
 
-            # Output path (override or scene)
-            if settings.override_output and settings.output_path:
-                out_path = bpy.path.abspath(settings.output_path)
-            else:
-                out_path = bpy.path.abspath(scene.render.filepath)
-
-            # Overrides (keyed by template flag IDs)
+            # Overrides (keyed by template flag IDs); output path is override or scene
             overrides = {
-                "scene_file": bpy.data.filepath,
-                "output_path": out_path,
+                "scene_file": blend_path,
+                "output_path": override_out or abspath(scene.render.filepath),
             }
 
             # Include scene name for multi-scene or non-default scene
-            if len(scenes) > 1 or scene.name != "Scene":
-                overrides["scene_name"] = scene.name
-
-            ts = int(time.time() * 1000) + submitted
-
-            submission = {
-                "_version": 1,
-                "template_id": template_id,
-                "job_name": job_name,
-                "submitted_by_host": hostname,
-                "submitted_at_ms": ts,
-                "overrides": overrides,
-                "frame_start": f_start,
-                "frame_end": f_end,
-                "chunk_size": settings.chunk_size,
-                "priority": settings.priority,
-            }
-
-            filename = "{:013d}.{}.json".format(ts, hostname)
-            filepath = os.path.join(submissions_dir, filename)
+            if multi or scene_name != "Scene":
+                overrides["scene_name"] = scene_name
 
+            seq = next(_submit_counter)
+            filepath = _SUBMISSIONS_DIR_SEP + f"{now_ms:013d}.{seq:04d}.{_HOSTNAME}.json"
             try:
-                tmp_path = filepath + ".tmp"
-                with open(tmp_path, "w", encoding="utf-8") as f:
-                    json.dump(submission, f, indent=2)
-                os.replace(tmp_path, filepath)
-                submitted += 1
+                data = encode_submission(
+                    template_id, job_name, _HOSTNAME, now_ms, overrides,
+                    f_start, f_end, chunk_size, priority)
             except Exception as e:
+                # Nothing is in the dropbox yet, so there's nothing to roll back
                 self.report({'ERROR'}, "Failed to write submission: {}".format(e))
                 return {'CANCELLED'}
+            payloads.append((filepath, data))
+
+        # Write the batch; on failure remove what was already published so a
+        # multi-scene submit doesn't leave a partial set in the dropbox
+        written = []
+        try:
+            for filepath, data in payloads:
+                tmp_path = filepath + ".tmp"
+                _write_bytes(tmp_path, data)
+                os.replace(tmp_path, filepath)
+                written.append(filepath)
+        except Exception as e:
+            for path in written + [tmp_path]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            _clear_caches()
+            self.report({'ERROR'}, "Failed to write submission: {}".format(e))
+            return {'CANCELLED'}
+        submitted = len(written)
 
         _submit_cooldown_until = time.time() + _SUBMIT_COOLDOWN_SECS
         self.report({'INFO'}, "Submitted {} job{}".format(
@@ -289,16 +438,10 @@ class MIDRENDER_PT_main(Panel):
         scene = context.scene
 
         # Check farm connection
-        farm = get_farm_path()
+        farm, farm_msg = _farm_status()
         if not farm:
             layout.label(text="Farm not connected", icon='ERROR')
-            config = read_config()
-            if not config:
-                layout.label(text="MidRender config not found.")
-            elif not config.get("sync_root"):
-                layout.label(text="Set sync root in MidRender Monitor.")
-            else:
-                layout.label(text="Farm folder not found.")
+            layout.label(text=farm_msg)
             return
 
         # Scene info
@@ -370,17 +513,17 @@ classes = (
     MIDRENDER_PT_main,
 )
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
 
 def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    _register_classes()
     bpy.types.Scene.midrender = bpy.props.PointerProperty(type=MidRenderSettings)
 
 
 def unregister():
     del bpy.types.Scene.midrender
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    _unregister_classes()
 
 
 if __name__ == "__main__":
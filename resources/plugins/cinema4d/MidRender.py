@@ -7,48 +7,150 @@
 # The running MidRender Monitor picks up submissions and routes them to the leader.
 
 import c4d
+import itertools
 import json
 import os
 import platform
 import socket
 import time
+import types
+from functools import lru_cache
 
 
+# -- Shared helpers ------------------------------------------------------------
+# Everything down to "End shared helpers" is duplicated verbatim in blender/MidRender.py
+# and cinema4d/MidRender.py (each plugin installs as a single file). Keep in sync.
+
 # -- Config helpers ------------------------------------------------------------
 
-def get_config_dir():
-    s = platform.system()
-    if s == "Windows":
+def _compute_config_dir():
+    sys = platform.system()
+    if sys == "Windows":
         return os.path.join(os.environ.get("LOCALAPPDATA", ""), "MidRender")
-    elif s == "Darwin":
+    elif sys == "Darwin":
         return os.path.expanduser("~/Library/Application Support/MidRender")
-    xdg = os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
-    return os.path.join(xdg, "MidRender")
+    else:
+        xdg = os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+        return os.path.join(xdg, "MidRender")
+
+
+# Resolved once -- platform and env don't change while the host app runs
+_CONFIG_DIR = _compute_config_dir()
+_SUBMISSIONS_DIR = os.path.join(_CONFIG_DIR, "submissions")
+_SUBMISSIONS_DIR_SEP = _SUBMISSIONS_DIR + os.sep
+_CONFIG_PATH = os.path.join(_CONFIG_DIR, "config.json")
+
+# Looked up once -- gethostname() can stall on slow DNS/mDNS, and submit runs on the UI thread
+_HOSTNAME = socket.gethostname()
+
+# Wall-clock submission timestamps, clamped to be strictly increasing so an NTP
+# step back can't reorder submissions; the counter breaks ties in filenames
+_last_ts_ms = 0
+_submit_counter = itertools.count()
+
+
+def _now_ms():
+    global _last_ts_ms
+    _last_ts_ms = max(int(time.time() * 1000), _last_ts_ms + 1)
+    return _last_ts_ms
+
+
+_submissions_dir_ready = False
+
+
+def get_config_dir():
+    return _CONFIG_DIR
 
 
 def get_submissions_dir():
-    d = os.path.join(get_config_dir(), "submissions")
-    os.makedirs(d, exist_ok=True)
-    return d
+    """Local submissions dropbox -- monitor polls this directory."""
+    global _submissions_dir_ready
+    if not _submissions_dir_ready:
+        os.makedirs(_SUBMISSIONS_DIR, exist_ok=True)
+        _submissions_dir_ready = True
+    return _SUBMISSIONS_DIR
+
+
+@lru_cache(maxsize=4)
+def _read_config_cached(config_path, mtime_ns):
+    # Raises on failure so lru_cache never stores a miss -- a read that races the
+    # Monitor rewriting config.json must not stick under an unchanged mtime
+    with open(config_path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 
 def read_config():
-    p = os.path.join(get_config_dir(), "config.json")
-    if not os.path.isfile(p):
-        return None
+    """Parsed config.json, re-read only when the file's mtime changes."""
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            return json.load(f)
+        mtime_ns = os.stat(_CONFIG_PATH).st_mtime_ns
+        return _read_config_cached(_CONFIG_PATH, mtime_ns)
     except Exception:
         return None
 
 
 def get_farm_path():
+    # Only the parsed config is cached; the folder check stays live so an
+    # unmounted sync drive is reported as disconnected
     config = read_config()
     if not config or not config.get("sync_root"):
         return None
     farm = os.path.join(config["sync_root"], "MidRender-v2")
-    return farm if os.path.isdir(farm) else None
+    if os.path.isdir(farm):
+        return farm
+    return None
+
+
+def clear_config_cache():
+    """Drop cached config lookups so the next call hits the disk again."""
+    global _submissions_dir_ready
+    _read_config_cached.cache_clear()
+    _submissions_dir_ready = False
+
+
+# -- Submission I/O ------------------------------------------------------------
+
+# orjson is optional (not bundled with Blender/C4D); both paths emit compact UTF-8 bytes
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# Fixed v1 submission schema: scalars are formatted in directly, only strings and
+# the overrides dict go through the JSON encoder
+_SUBMISSION_TPL = (
+    b'{"_version":1,"template_id":%b,"job_name":%b,"submitted_by_host":%b,'
+    b'"submitted_at_ms":%d,"overrides":%b,"frame_start":%d,"frame_end":%d,'
+    b'"chunk_size":%d,"priority":%d}'
+)
+
+
+def encode_submission(template_id, job_name, host, ts, overrides,
+                      frame_start, frame_end, chunk_size, priority):
+    return _SUBMISSION_TPL % (
+        _dumps(template_id), _dumps(job_name), _dumps(host), ts, _dumps(overrides),
+        frame_start, frame_end, chunk_size, priority)
+
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_bytes(path, data):
+    """Write a small blob straight to the fd, skipping Python's buffered I/O stack."""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# -- End shared helpers --------------------------------------------------------
 
 
 # -- Template ID ---------------------------------------------------------------
@@ -58,30 +160,49 @@ TEMPLATE_ID = "cinema4d-2026-plugin"
 
 # -- Takes enumeration ---------------------------------------------------------
 
+_INDENTS = [""]
+
+
 def collect_takes(doc):
-    """Return [(take_object, display_name)] for the Take dropdown."""
+    """Return ([(take_object, display_name)], {take_guid: index}) for the Take dropdown."""
     result = []
+    index = {}
     td = doc.GetTakeData()
     if not td:
-        return result
-
-    def walk(take, depth=0):
-        if not take:
-            return
-        indent = "  " * depth
-        result.append((take, indent + take.GetName()))
+        return result, index
+
+    main_take = td.GetMainTake()
+    stack = [(main_take, 0)] if main_take else []
+    while stack:
+        take, depth = stack.pop()
+        while len(_INDENTS) <= depth:
+            _INDENTS.append(_INDENTS[-1] + "  ")
+        index[take.GetGUID()] = len(result)
+        result.append((take, _INDENTS[depth] + take.GetName()))
+
+        # Push children in reverse so they pop in document order
+        children = []
         child = take.GetDown()
         while child:
-            walk(child, depth + 1)
+            children.append((child, depth + 1))
             child = child.GetNext()
+        stack.extend(reversed(children))
+
+    return result, index
 
-    walk(td.GetMainTake())
-    return result
+
+# -- Output path ---------------------------------------------------------------
+
+def resolve_output_path(path, doc_path):
+    """Anchor a relative render output path at the document folder."""
+    if path and doc_path and not os.path.isabs(path):
+        return os.path.join(doc_path, path)
+    return path
 
 
 # -- C4D format ID to -oformat string mapping ----------------------------------
 
-FORMAT_MAP = {
+FORMAT_MAP = types.MappingProxyType({
     1103: "TIFF",
     1101: "TGA",
     1100: "BMP",
@@ -91,11 +212,7 @@ FORMAT_MAP = {
     1023540: "HDR",
     1023737: "DPX",
     1125: "AVI",
-}
-
-
-def format_id_to_string(fid):
-    return FORMAT_MAP.get(fid, "")
+})
 
 
 # -- Dialog --------------------------------------------------------------------
@@ -119,6 +236,8 @@ class MidRenderDialog(c4d.gui.GeDialog):
     def __init__(self):
         super().__init__()
         self.takes = []
+        self.take_index = {}
+        self.takes_ready = False
         self.scene_frame_start = 0
         self.scene_frame_end = 90
         self.scene_output = ""
@@ -133,19 +252,13 @@ class MidRenderDialog(c4d.gui.GeDialog):
         # Cache scene values
         self.scene_frame_start = rd[c4d.RDATA_FRAMEFROM].GetFrame(fps)
         self.scene_frame_end = rd[c4d.RDATA_FRAMETO].GetFrame(fps)
-        self.scene_output = rd[c4d.RDATA_PATH] or ""
-
-        # Resolve relative output path
-        if self.scene_output and not os.path.isabs(self.scene_output):
-            doc_path = doc.GetDocumentPath()
-            if doc_path:
-                self.scene_output = os.path.join(doc_path, self.scene_output)
+        doc_path = doc.GetDocumentPath()
+        self.scene_output = resolve_output_path(rd[c4d.RDATA_PATH] or "", doc_path)
 
         # -- Scene info --
         self.GroupBegin(0, c4d.BFH_SCALEFIT, cols=1)
         self.GroupBorderSpace(6, 6, 6, 6)
         doc_name = doc.GetDocumentName()
-        doc_path = doc.GetDocumentPath()
         if doc_path:
             self.AddStaticText(ID_SCENE_LABEL, c4d.BFH_LEFT, name=doc_name)
         else:
@@ -161,16 +274,10 @@ class MidRenderDialog(c4d.gui.GeDialog):
         self.AddComboBox(ID_TAKE_COMBO, c4d.BFH_SCALEFIT)
         self.GroupEnd()
 
-        self.takes = collect_takes(doc)
-        td = doc.GetTakeData()
-        current_take = td.GetCurrentTake() if td else None
-        current_idx = 0
-
-        for i, (take, display_name) in enumerate(self.takes):
-            self.AddChild(ID_TAKE_COMBO, i, display_name)
-            if take == current_take:
-                current_idx = i
-        self.SetInt32(ID_TAKE_COMBO, current_idx)
+        # Filled in from Timer() so walking a large take tree doesn't delay the dialog
+        # opening; each open still walks the tree once (nothing is cached across runs)
+        self.AddChild(ID_TAKE_COMBO, 0, "(Loading\u2026)")
+        self.SetInt32(ID_TAKE_COMBO, 0)
 
         self.AddSeparatorH(0, c4d.BFH_SCALEFIT)
 
@@ -226,6 +333,24 @@ class MidRenderDialog(c4d.gui.GeDialog):
 
         return True
 
+    def _populate_takes(self):
+        doc = c4d.documents.GetActiveDocument()
+        self.takes, self.take_index = collect_takes(doc)
+        td = doc.GetTakeData()
+        current_take = td.GetCurrentTake() if td else None
+        current_idx = self.take_index.get(current_take.GetGUID(), 0) if current_take else 0
+
+        self.FreeChildren(ID_TAKE_COMBO)
+        for i, (_, display_name) in enumerate(self.takes):
+            self.AddChild(ID_TAKE_COMBO, i, display_name)
+        self.SetInt32(ID_TAKE_COMBO, current_idx)
+        self.takes_ready = True
+
+    def Timer(self, msg):
+        self.SetTimer(0)
+        if not self.takes_ready:
+            self._populate_takes()
+
     def InitValues(self):
         self.SetInt32(ID_FRAME_START, self.scene_frame_start)
         self.SetInt32(ID_FRAME_END, self.scene_frame_end)
@@ -250,6 +375,8 @@ class MidRenderDialog(c4d.gui.GeDialog):
                 self.SetString(ID_STATUS_TEXT, "Farm not initialized.")
             self.Enable(ID_SUBMIT_BTN, False)
 
+        self.takes_ready = False
+        self.SetTimer(1)
         return True
 
     def Command(self, id, msg):
@@ -271,6 +398,7 @@ class MidRenderDialog(c4d.gui.GeDialog):
         # -- Validate farm --
         farm = get_farm_path()
         if not farm:
+            clear_config_cache()
             c4d.gui.MessageDialog("Farm not connected.\nIs MidRender Monitor running?")
             return
 
@@ -286,10 +414,13 @@ class MidRenderDialog(c4d.gui.GeDialog):
 
         scene_filepath = os.path.join(doc_path, doc_name)
 
-        # -- Save document --
-        c4d.documents.SaveDocument(
-            doc, scene_filepath,
-            c4d.SAVEDOCUMENTFLAGS_NONE, c4d.FORMAT_C4DEXPORT)
+        # -- Save document (only if modified -- saving large scenes is slow) --
+        if doc.GetChanged():
+            if not c4d.documents.SaveDocument(
+                    doc, scene_filepath,
+                    c4d.SAVEDOCUMENTFLAGS_NONE, c4d.FORMAT_C4DEXPORT):
+                c4d.gui.MessageDialog("Failed to save document.")
+                return
 
         # -- Frame range --
         if self.GetBool(ID_OVERRIDE_RANGE):
@@ -305,7 +436,7 @@ class MidRenderDialog(c4d.gui.GeDialog):
 
         # -- Output path --
         if self.GetBool(ID_OVERRIDE_OUTPUT):
-            output_path = self.GetString(ID_OUTPUT_PATH)
+            output_path = resolve_output_path(self.GetString(ID_OUTPUT_PATH), doc_path)
         else:
             output_path = self.scene_output
 
@@ -315,6 +446,8 @@ class MidRenderDialog(c4d.gui.GeDialog):
             return
 
         # -- Take --
+        if not self.takes_ready:
+            self._populate_takes()
         take_name = ""
         take_idx = self.GetInt32(ID_TAKE_COMBO)
         if 0 <= take_idx < len(self.takes):
@@ -327,7 +460,7 @@ class MidRenderDialog(c4d.gui.GeDialog):
                     take_name = take_obj.GetName()
 
         # -- Output format (from scene, for reference only) --
-        format_str = format_id_to_string(rd[c4d.RDATA_FORMAT])
+        format_str = FORMAT_MAP.get(rd[c4d.RDATA_FORMAT], "")
 
         # -- Build overrides --
         overrides = {
@@ -346,33 +479,22 @@ class MidRenderDialog(c4d.gui.GeDialog):
 
         chunk_size = self.GetInt32(ID_CHUNK_SIZE)
         priority = self.GetInt32(ID_PRIORITY)
-        hostname = socket.gethostname()
-        ts = int(time.time() * 1000)
-
-        submission = {
-            "_version": 1,
-            "template_id": TEMPLATE_ID,
-            "job_name": job_name,
-            "submitted_by_host": hostname,
-            "submitted_at_ms": ts,
-            "overrides": overrides,
-            "frame_start": frame_start,
-            "frame_end": frame_end,
-            "chunk_size": chunk_size,
-            "priority": priority,
-        }
+        ts = _now_ms()
 
         # -- Write submission JSON --
-        submissions_dir = get_submissions_dir()
-        filename = "{:013d}.{}.json".format(ts, hostname)
-        out_path = os.path.join(submissions_dir, filename)
+        get_submissions_dir()
+        seq = next(_submit_counter)
+        out_path = _SUBMISSIONS_DIR_SEP + f"{ts:013d}.{seq:04d}.{_HOSTNAME}.json"
 
         try:
+            data = encode_submission(
+                TEMPLATE_ID, job_name, _HOSTNAME, ts, overrides,
+                frame_start, frame_end, chunk_size, priority)
             tmp_path = out_path + ".tmp"
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(submission, f, indent=2)
+            _write_bytes(tmp_path, data)
             os.replace(tmp_path, out_path)
         except Exception as e:
+            clear_config_cache()
             c4d.gui.MessageDialog("Failed to write submission:\n{}".format(e))
             return
 